@@ -96,6 +96,8 @@ mod arena;
 mod array;
 mod consts;
 mod dataset;
+#[cfg(feature = "log_viewer")]
+mod log_viewer;
 mod macros;
 mod py_helper;
 mod rankings;
@@ -132,6 +134,8 @@ static GLOBAL: mimalloc::MiMalloc = mimalloc::MiMalloc;
 /// - Definitions of observation and action space for Mortal (via `consts`).
 /// - Statistical works on mjai logs (via `stat.Stat`).
 /// - mjai interface (via `mjai.Bot`).
+/// - HTML generation for the log viewer (via `log_viewer`, with the
+///   `log_viewer` feature).
 #[pymodule]
 fn libriichi(py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
     pyo3_log::init();
@@ -154,6 +158,8 @@ fn libriichi(py: Python<'_>, m: &Bound<'_, PyModule>) -> PyResult<()> {
     arena::register_module(py, name, m)?;
     stat::register_module(py, name, m)?;
     mjai::register_module(py, name, m)?;
+    #[cfg(feature = "log_viewer")]
+    log_viewer::register_module(py, name, m)?;
 
     Ok(())
 }
@@ -0,0 +1,276 @@
+//! Native fast path of `view-logs/generate_mjai_html.py`.
+
+use crate::py_helper::add_submodule;
+use std::ffi::OsString;
+use std::fs::{self, File};
+use std::io::{self, BufRead, BufWriter, Read, Write};
+use std::path::{Path, PathBuf};
+
+use anyhow::{Context, Result};
+use flate2::bufread::GzDecoder;
+use pyo3::prelude::*;
+use rayon::prelude::*;
+use rayon::{ThreadPool, ThreadPoolBuilder};
+use serde::de::IgnoredAny;
+use serde_json as json;
+
+const WRITE_BUFFER_SIZE: usize = 1 << 16;
+
+/// Generates HTML files for gzipped mjai logs, by placing each log between
+/// the template parts `before` and `after`. Files are processed in parallel
+/// on `workers` threads (default: number of CPUs), which are kept for the
+/// lifetime of the object.
+///
+/// The log is normalized the same way as `_clean_mjai_log` in
+/// `generate_mjai_html.py`: lines are split at `\n`, `\r` and `\r\n`,
+/// whitespace around them is trimmed and blank lines are dropped, and with
+/// `validate`, lines that are not valid JSON are skipped as well. Zero padding
+/// between and after gzip members is skipped.
+///
+/// Unlike the Python implementation, which prints them, warnings and errors
+/// are reported through Python's `logging`.
+#[pyclass]
+pub struct HtmlGenerator {
+    before: Vec<u8>,
+    after: Vec<u8>,
+    output_dir: Option<PathBuf>,
+    validate: bool,
+    pool: ThreadPool,
+}
+
+#[pymethods]
+impl HtmlGenerator {
+    #[new]
+    #[pyo3(signature = (before, after, *, output_dir=None, validate=false, workers=None))]
+    fn new(
+        before: &[u8],
+        after: &[u8],
+        output_dir: Option<PathBuf>,
+        validate: bool,
+        workers: Option<usize>,
+    ) -> Result<Self> {
+        let pool = ThreadPoolBuilder::new()
+            .num_threads(workers.unwrap_or(0))
+            .build()?;
+        Ok(Self {
+            before: before.to_vec(),
+            after: after.to_vec(),
+            output_dir,
+            validate,
+            pool,
+        })
+    }
+
+    /// Generates one HTML file per log in `paths` with the GIL released.
+    ///
+    /// Returns the path of each generated file, or `None` for the logs that
+    /// failed, in the order of `paths`.
+    fn generate(&self, paths: Vec<PathBuf>, py: Python<'_>) -> Vec<Option<PathBuf>> {
+        py.allow_threads(move || {
+            self.pool.install(|| {
+                paths
+                    .par_iter()
+                    .map(|path| {
+                        self.generate_html_file(path)
+                            .map_err(|err| log::error!("{err:#}"))
+                            .ok()
+                    })
+                    .collect()
+            })
+        })
+    }
+}
+
+impl HtmlGenerator {
+    fn generate_html_file(&self, path: &Path) -> Result<PathBuf> {
+        let raw = fs::read(path)
+            .and_then(|compressed| gunzip(&compressed))
+            .with_context(|| format!("error when reading {}", path.display()))?;
+
+        let output_path = output_path(path, self.output_dir.as_deref())?;
+        let mut temp_path = OsString::from(&output_path);
+        temp_path.push(".tmp");
+
+        // Write to a temporary file first so that a failure never leaves a
+        // truncated HTML file behind.
+        let inner = || {
+            let mut w = BufWriter::with_capacity(WRITE_BUFFER_SIZE, File::create(&temp_path)?);
+            w.write_all(&self.before)?;
+            write_log(&mut w, &raw, path, self.validate)?;
+            w.write_all(&self.after)?;
+            w.flush()?;
+            fs::rename(&temp_path, &output_path)
+        };
+        if let Err(err) = inner() {
+            fs::remove_file(&temp_path).ok();
+            return Err(err)
+                .with_context(|| format!("error when writing {}", output_path.display()));
+        }
+
+        Ok(output_path)
+    }
+}
+
+/// Returns the HTML path generated for `path`, replacing ".json.gz" in its
+/// file name with ".html" like `_output_path` does. File names that are not
+/// valid UTF-8 are kept as they are otherwise.
+fn output_path(path: &Path, output_dir: Option<&Path>) -> Result<PathBuf> {
+    const FROM: &[u8] = b".json.gz";
+    const TO: &[u8] = b".html";
+
+    let name = path
+        .file_name()
+        .with_context(|| format!("{} is not a file", path.display()))?
+        .as_encoded_bytes();
+    let mut html_name = Vec::with_capacity(name.len());
+    let mut rest = name;
+    while let Some(i) = rest.windows(FROM.len()).position(|w| w == FROM) {
+        html_name.extend_from_slice(&rest[..i]);
+        html_name.extend_from_slice(TO);
+        rest = &rest[i + FROM.len()..];
+    }
+    html_name.extend_from_slice(rest);
+    // SAFETY: `name` is only split around occurrences of an ASCII string, and
+    // the pieces are joined with ASCII, both of which keep a valid encoding.
+    let html_name = unsafe { OsString::from_encoded_bytes_unchecked(html_name) };
+
+    let dir = match output_dir {
+        Some(dir) => dir,
+        None => path.parent().unwrap_or_else(|| Path::new("")),
+    };
+    Ok(dir.join(html_name))
+}
+
+/// Decompresses all gzip members in `compressed`, skipping the zero padding
+/// gzip allows between and after them, which `MultiGzDecoder` rejects.
+fn gunzip(mut compressed: &[u8]) -> io::Result<Vec<u8>> {
+    let mut raw = vec![];
+    loop {
+        let padding = compressed.iter().take_while(|&&b| b == 0).count();
+        compressed.consume(padding);
+        if compressed.is_empty() {
+            return Ok(raw);
+        }
+        // The decoder only consumes its own member from `compressed`.
+        GzDecoder::new(&mut compressed).read_to_end(&mut raw)?;
+    }
+}
+
+/// Equivalent to Python's `bytes.strip()`, which unlike `trim_ascii` also
+/// strips `\x0b`.
+const fn trim(mut s: &[u8]) -> &[u8] {
+    while let [b'\t'..=b'\r' | b' ', rest @ ..] = s {
+        s = rest;
+    }
+    while let [rest @ .., b'\t'..=b'\r' | b' '] = s {
+        s = rest;
+    }
+    s
+}
+
+fn write_log<W: Write>(w: &mut W, raw: &[u8], path: &Path, validate: bool) -> io::Result<()> {
+    let mut separator: &[u8] = b"";
+    // Splitting at either byte gives the lines of Python's `splitlines`, plus
+    // an empty one inside each "\r\n", which is dropped like any blank line.
+    for line in raw.split(|&b| b == b'\n' || b == b'\r').map(trim) {
+        if line.is_empty() {
+            continue;
+        }
+        if validate && json::from_slice::<IgnoredAny>(line).is_err() {
+            let head = String::from_utf8_lossy(&line[..line.len().min(100)]);
+            log::warn!(
+                "skipping invalid JSON line in {}: {head}...",
+                path.display(),
+            );
+            continue;
+        }
+        w.write_all(separator)?;
+        w.write_all(line)?;
+        separator = b"\n";
+    }
+    Ok(())
+}
+
+pub(crate) fn register_module(
+    py: Python<'_>,
+    prefix: &str,
+    super_mod: &Bound<'_, PyModule>,
+) -> PyResult<()> {
+    let m = PyModule::new(py, "log_viewer")?;
+    m.add_class::<HtmlGenerator>()?;
+    add_submodule(py, prefix, super_mod, &m)
+}
+
+#[cfg(test)]
+mod test {
+    use super::*;
+    use flate2::Compression;
+    use flate2::write::GzEncoder;
+
+    #[test]
+    fn normalize_log() {
+        let raw =
+            b"\n {\"type\":\"start_game\"} \r\n\n{bad\r{\"type\":\"end_kyoku\"}\x0b\n{\"type\":\"end_game\"}\n\x0b";
+
+        let path = Path::new("test");
+
+        let mut out = vec![];
+        write_log(&mut out, raw, path, true).unwrap();
+        assert_eq!(
+            out,
+            b"{\"type\":\"start_game\"}\n{\"type\":\"end_kyoku\"}\n{\"type\":\"end_game\"}"
+        );
+
+        out.clear();
+        write_log(&mut out, raw, path, false).unwrap();
+        assert_eq!(
+            out,
+            b"{\"type\":\"start_game\"}\n{bad\n{\"type\":\"end_kyoku\"}\n{\"type\":\"end_game\"}"
+        );
+    }
+
+    #[test]
+    fn gunzip_members() {
+        let gzip = |data: &[u8]| {
+            let mut e = GzEncoder::new(vec![], Compression::default());
+            e.write_all(data).unwrap();
+            e.finish().unwrap()
+        };
+
+        let mut compressed = gzip(b"foo\n");
+        compressed.extend_from_slice(&[0; 3]);
+        compressed.extend(gzip(b"bar"));
+        compressed.extend_from_slice(&[0; 5]);
+        assert_eq!(gunzip(&compressed).unwrap(), b"foo\nbar");
+        assert_eq!(gunzip(&[]).unwrap(), b"");
+
+        compressed.truncate(compressed.len() - 10);
+        gunzip(&compressed).unwrap_err();
+    }
+
+    #[test]
+    fn html_path() {
+        let html_path = |path: &str, output_dir: Option<&str>| {
+            output_path(Path::new(path), output_dir.map(Path::new)).unwrap()
+        };
+        assert_eq!(html_path("logs/a.json.gz", None), Path::new("logs/a.html"));
+        assert_eq!(
+            html_path("logs/a.json.gz", Some("out")),
+            Path::new("out/a.html")
+        );
+        assert_eq!(html_path("a.json.gz", None), Path::new("a.html"));
+    }
+
+    #[cfg(unix)]
+    #[test]
+    fn html_path_not_utf8() {
+        use std::ffi::OsStr;
+        use std::os::unix::ffi::OsStrExt;
+
+        let path = Path::new(OsStr::from_bytes(b"logs/\xff.json.gz"));
+        assert_eq!(
+            output_path(path, None).unwrap(),
+            Path::new(OsStr::from_bytes(b"logs/\xff.html")),
+        );
+    }
+}
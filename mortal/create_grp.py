@@ -2,11 +2,30 @@
 
 import torch
 import torch.nn as nn
+import argparse
 from datetime import datetime
 from model import GRP
 from config import config
 
-def create_grp_model():
+def empty_adam_state_dict(params, lr=1e-5):
+    """
+    Build the state dict of a freshly constructed Adam optimizer over params
+    without actually constructing one. Fields missing here are filled with
+    their defaults by the optimizer's load_state_dict.
+    """
+    return {
+        'state': {},
+        'param_groups': [{
+            'lr': lr,
+            'betas': (0.9, 0.999),
+            'eps': 1e-8,
+            'weight_decay': 0,
+            'amsgrad': False,
+            'params': list(range(sum(1 for _ in params))),
+        }],
+    }
+
+def create_grp_model(verify=False):
     """Create and save a GRP model with the configuration from config.toml"""
     
     # Get GRP configuration
@@ -19,22 +38,26 @@ def create_grp_model():
     # Create the model
     grp = GRP(hidden_size=hidden_size, num_layers=num_layers)
     
-    # Create a dummy optimizer state (in case it's needed)
-    optimizer = torch.optim.Adam(grp.parameters(), lr=1e-5)
-    
     # Create the state dict in the expected format
     state = {
         'timestamp': datetime.now().timestamp(),
         'model': grp.state_dict(),
-        'optimizer': optimizer.state_dict(),
+        # A dummy optimizer state (in case it's needed); steps is 0 so it is empty
+        'optimizer': empty_adam_state_dict(grp.parameters()),
         'steps': 0
     }
     
-    # Save the model
+    # Save the model. The legacy (non-zip) format skips the zip container and
+    # its per-record CRC32; torch.load reads both formats transparently. The
+    # default pickle protocol is kept because torch.load(weights_only=True),
+    # as used by train_grp.py, cannot read protocol 4+ opcodes.
     save_path = config['grp']['state_file']
-    torch.save(state, save_path)
+    torch.save(state, save_path, _use_new_zipfile_serialization=False)
     print(f"GRP model saved to: {save_path}")
     
+    if not verify:
+        return
+    
     # Verify the model can be loaded
     loaded_state = torch.load(save_path, weights_only=True, map_location=torch.device('cpu'))
     print("Model verification:")
@@ -43,4 +66,9 @@ def create_grp_model():
     print(f"  Timestamp: {datetime.fromtimestamp(loaded_state['timestamp'])}")
 
 if __name__ == "__main__":
-    create_grp_model()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description='Create an untrained GRP model')
+    parser.add_argument('--verify', action='store_true',
+                        help='Reload the saved file and print a summary of its contents')
+    args = parser.parse_args()
+    
+    create_grp_model(verify=args.verify)
\ No newline at end of file
@@ -7,111 +7,571 @@ It extracts the log data, replaces the template in index.example.html, and
 creates individual HTML files for each log.
 """
 
-import gzip
-import json
+import asyncio
+import mmap
 import os
-import shutil
+import subprocess
 import sys
 import argparse
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
+from dataclasses import dataclass
+from fnmatch import fnmatch
+from functools import partial
+from itertools import islice
 from pathlib import Path
 
+try:
+    import orjson as json
+except ImportError:
+    import json
 
-def extract_mjai_log(json_gz_path):
+try:
+    from isal import isal_zlib as zlib
+except ImportError:
+    import zlib
+
+try:
+    import aiofiles
+except ImportError:
+    aiofiles = None
+
+# Native implementation of directory processing, available when libriichi
+# (built from this repository with the log_viewer feature) is importable, e.g.
+# with PYTHONPATH=../mortal
+try:
+    from libriichi.log_viewer import HtmlGenerator as NativeHtmlGenerator
+except ImportError:
+    NativeHtmlGenerator = None
+
+# zlib window bits selecting the gzip container format
+GZIP_WBITS = 31
+
+# Size of the compressed reads when streaming a log into its HTML file
+READ_CHUNK_SIZE = 1 << 20
+
+# Report directory progress once per this many files
+PROGRESS_INTERVAL = 100
+
+# Number of files handed to the native implementation per call. Each call
+# waits for its slowest file, so batches are large enough to make that rare.
+NATIVE_BATCH_SIZE = 8192
+
+# Number of files in flight at once with --async-io
+ASYNC_IO_CONCURRENCY = 64
+
+
+def _iter_gunzip(compressed_chunks):
+    """
+    Incrementally decompress gzip data, without going through GzipFile.
+    
+    Args:
+        compressed_chunks: Iterable of bytes making up gzip data, possibly
+            several concatenated members
+        
+    Yields:
+        bytes: Chunks of decompressed data
+    """
+    decompressor = None
+    for data in compressed_chunks:
+        while data:
+            if decompressor is None:
+                # Skip the zero padding gzip allows between and after members
+                data = data.lstrip(b'\0')
+                if not data:
+                    break
+                decompressor = zlib.decompressobj(GZIP_WBITS)
+            
+            chunk = decompressor.decompress(data)
+            if chunk:
+                yield chunk
+            
+            if decompressor.eof:
+                data = decompressor.unused_data
+                decompressor = None
+            else:
+                data = b''
+    
+    if decompressor is not None:
+        raise EOFError("Compressed file ended before the end-of-stream marker was reached")
+
+
+def _gunzip(compressed):
+    """Decompress gzip data held in memory in one call."""
+    chunks = list(_iter_gunzip((compressed,)))
+    return chunks[0] if len(chunks) == 1 else b''.join(chunks)
+
+
+def _read_file(path):
+    """Read a whole file as bytes."""
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _iter_log_chunks(json_gz_path, use_zcat=False):
     """
-    Extract mjai log data from a .json.gz file.
+    Stream the decompressed contents of a .json.gz file.
     
     Args:
         json_gz_path (str): Path to the .json.gz file
+        use_zcat (bool): Decompress through an external zcat process (default: False)
+        
+    Yields:
+        bytes: Chunks of decompressed data
+    """
+    if use_zcat:
+        # zcat rejects empty files, which _iter_gunzip reads as an empty log
+        if os.path.getsize(json_gz_path) == 0:
+            return
+        with subprocess.Popen(['zcat', json_gz_path], stdout=subprocess.PIPE,
+                              stderr=subprocess.PIPE) as proc:
+            yield from iter(partial(proc.stdout.read, READ_CHUNK_SIZE), b'')
+            stderr = proc.stderr.read()
+        message = stderr.decode('utf-8', 'replace').strip()
+        # Exit status 2 only reports warnings. Trailing zero padding passes
+        # silently, but zcat ignores everything after padding between members
+        # ("trailing garbage ignored"), while _iter_gunzip keeps reading.
+        if proc.returncode == 2:
+            print(f"Warning: {message}")
+        elif proc.returncode != 0:
+            raise RuntimeError(f"zcat exited with status {proc.returncode}: {message}")
+    else:
+        with open(json_gz_path, 'rb') as f:
+            yield from _iter_gunzip(iter(partial(f.read, READ_CHUNK_SIZE), b''))
+
+
+def _valid_lines(lines, json_gz_path, validate=True):
+    """
+    Strip log lines, dropping empty ones and, optionally, those that are not valid JSON.
+    
+    Empty lines are always dropped, since the viewer parses every line of the
+    log data as JSON.
+    
+    Args:
+        lines: Iterable of raw log lines as bytes
+        json_gz_path (str): Path of the source file, for warnings
+        validate (bool): Check that every line is valid JSON (default: True)
         
     Returns:
-        str: The extracted mjai log data as a multi-line string
+        list: The remaining lines as bytes
     """
+    # Strip and skip empty lines without running any per-line bytecode
+    lines = list(filter(None, map(bytes.strip, lines)))
+    if not validate:
+        return lines
+    
+    # Fast path: logs are almost always well-formed, so validate every line in
+    # one C-level pass and only fall back to the per-line loop to find bad ones
     try:
-        with gzip.open(json_gz_path, 'rt', encoding='utf-8') as f:
-            lines = []
-            for line in f:
-                line = line.strip()
-                if line:  # Skip empty lines
-                    # Validate that it's valid JSON
-                    try:
-                        json.loads(line)
-                        lines.append(line)
-                    except json.JSONDecodeError:
-                        print(f"Warning: Skipping invalid JSON line in {json_gz_path}: {line[:100]}...")
-                        continue
-            
-            return '\n'.join(lines)
+        deque(map(json.loads, lines), maxlen=0)
+        return lines
+    except ValueError:
+        pass
     
+    valid_lines = []
+    for line in lines:
+        # Validate that it's valid JSON
+        try:
+            json.loads(line)
+            valid_lines.append(line)
+        except ValueError:
+            print(f"Warning: Skipping invalid JSON line in {json_gz_path}: {line[:100].decode('utf-8', 'replace')}...")
+            continue
+    
+    return valid_lines
+
+
+def _clean_mjai_log(raw, json_gz_path, validate=False):
+    """
+    Normalize decompressed mjai log data, dropping empty and optionally invalid lines.
+    
+    Args:
+        raw (bytes): Decompressed log data
+        json_gz_path (str): Path of the source file, for warnings
+        validate (bool): Check that every line is valid JSON (default: False)
+        
+    Returns:
+        bytes: The mjai log data as multi-line UTF-8 bytes
+    """
+    return b'\n'.join(_valid_lines(raw.splitlines(), json_gz_path, validate))
+
+
+def _write_mjai_log(f, chunks, json_gz_path, validate=False):
+    """
+    Streaming counterpart of _clean_mjai_log, writing the result to f.
+    
+    Only one chunk (plus a partial line) is held in memory at a time.
+    
+    Args:
+        f: Binary file object to write to
+        chunks: Iterable of decompressed log data as bytes
+        json_gz_path (str): Path of the source file, for warnings
+        validate (bool): Check that every line is valid JSON (default: False)
+    """
+    # Split the way _clean_mjai_log does, so a lone '\r' also ends a line. The
+    # last piece is always held back: it may be an incomplete line, or a '\r'
+    # whose '\n' only arrives with the next chunk.
+    separator = b''
+    partial_line = b''
+    for chunk in chunks:
+        lines = (partial_line + chunk).splitlines(keepends=True)
+        partial_line = lines.pop() if lines else b''
+        lines = _valid_lines(lines, json_gz_path, validate)
+        if lines:
+            f.write(separator)
+            f.write(b'\n'.join(lines))
+            separator = b'\n'
+    
+    lines = _valid_lines((partial_line,), json_gz_path, validate)
+    if lines:
+        f.write(separator)
+        f.write(lines[0])
+
+
+def decode_mjai_log(compressed, json_gz_path, validate=False):
+    """
+    Extract mjai log data from the already-read contents of a .json.gz file.
+    
+    Args:
+        compressed (bytes): Contents of the .json.gz file
+        json_gz_path (str): Path of the source file, for messages
+        validate (bool): Check that every line is valid JSON (default: False)
+        
+    Returns:
+        bytes: The extracted mjai log data as multi-line UTF-8 bytes
+    """
+    try:
+        raw = _gunzip(compressed)
     except Exception as e:
         print(f"Error extracting {json_gz_path}: {e}")
         return None
+    
+    return _clean_mjai_log(raw, json_gz_path, validate)
 
 
-def generate_html_file(json_gz_path, template_path, output_dir=None):
+@dataclass(frozen=True)
+class Template:
+    """The HTML template split around the allActions log data."""
+    fd: int  # open descriptor of the template file, for in-kernel copies
+    mapping: mmap.mmap  # the mapped template file
+    before_data: memoryview  # mapped template content preceding the log data
+    after_data: memoryview  # mapped template content following the log data
+    after_offset: int  # file offset of after_data
+    
+    def close(self):
+        """Unmap the template and close its descriptor."""
+        if self.mapping.closed:
+            return
+        # The mapping cannot be closed while views into it are alive
+        self.before_data.release()
+        self.after_data.release()
+        self.mapping.close()
+        os.close(self.fd)
+
+
+def _prepare_template(template_path):
     """
-    Generate an HTML file from a .json.gz mjai log file.
+    Read the HTML template and split it around the allActions log data.
     
     Args:
-        json_gz_path (str): Path to the .json.gz file
         template_path (str): Path to the index.example.html template
-        output_dir (str): Directory to save the HTML file (default: same as json_gz_path)
         
     Returns:
-        str: Path to the generated HTML file, or None if failed
+        Template: The split template, or None if failed
     """
-    # Extract the mjai log data
-    mjai_data = extract_mjai_log(json_gz_path)
-    if mjai_data is None:
-        return None
-    
-    # Read the template file
+    # Map the file instead of reading it so that all worker processes share the
+    # same page cache pages rather than each holding a private copy. The output
+    # is written as bytes, so no decoding is needed either. The descriptor is
+    # kept open until Template.close to copy from with copy_file_range.
     try:
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template_content = f.read()
+        fd = os.open(template_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+        try:
+            template_content = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except Exception:
+            os.close(fd)
+            raise
     except Exception as e:
         print(f"Error reading template {template_path}: {e}")
         return None
     
     # Find the start and end of the allActions template section
-    start_marker = "allActions = `\n"
-    end_marker = "\n    `.trim().split('\\n').map(s => JSON.parse(s))"
+    start_marker = b"allActions = `\n"
+    end_marker = b"\n    `.trim().split('\\n').map(s => JSON.parse(s))"
     
     start_pos = template_content.find(start_marker)
-    end_pos = template_content.find(end_marker)
+    end_pos = -1
+    if start_pos != -1:
+        start_pos += len(start_marker)
+        end_pos = template_content.find(end_marker, start_pos)
     
-    if start_pos == -1 or end_pos == -1:
+    if end_pos == -1:
         print(f"Error: Could not find template markers in {template_path}")
+        template_content.close()
+        os.close(fd)
         return None
     
-    # Replace the template data with the extracted mjai data
-    before_data = template_content[:start_pos + len(start_marker)]
-    after_data = template_content[end_pos:]
-    
-    new_content = before_data + mjai_data + after_data
-    
-    # Generate output filename
+    with memoryview(template_content) as template_view:
+        return Template(fd, template_content, template_view[:start_pos], template_view[end_pos:],
+                        end_pos)
+
+
+def _output_path(json_gz_path, output_dir=None):
+    """Return the HTML path generated for a .json.gz file."""
     json_gz_name = os.path.basename(json_gz_path)
     html_name = json_gz_name.replace('.json.gz', '.html')
     
     if output_dir is None:
         output_dir = os.path.dirname(json_gz_path)
     
-    output_path = os.path.join(output_dir, html_name)
+    return os.path.join(output_dir, html_name)
+
+
+def _write_html(output_path, chunks):
+    """Write byte chunks to output_path."""
+    with open(output_path, 'wb') as f:
+        f.writelines(chunks)
+
+
+def _write_template_part(f, fd, offset, data):
+    """
+    Write a part of the template to f.
+    
+    Where supported, the bytes are copied from the template file to f inside
+    the kernel, without passing through user space; whatever could not be
+    copied that way (e.g. on filesystems without copy_file_range support) is
+    written from data.
+    
+    Args:
+        f: Binary file object to write to
+        fd (int): Descriptor of the template file
+        offset (int): Offset of the part in the template file
+        data (bytes-like): The part's content
+    """
+    done = 0
+    if hasattr(os, 'copy_file_range'):
+        f.flush()
+        try:
+            while done < len(data):
+                copied = os.copy_file_range(fd, f.fileno(), len(data) - done, offset + done)
+                if copied == 0:
+                    break
+                done += copied
+        except OSError:
+            pass
+    
+    f.write(data[done:])
+
+
+def generate_html_file(json_gz_path, template, output_dir=None, validate=False, use_zcat=False,
+                       verbose=True):
+    """
+    Generate an HTML file from a .json.gz mjai log file.
     
-    # Write the new HTML file
+    Args:
+        json_gz_path (str): Path to the .json.gz file
+        template (Template): The split HTML template (see _prepare_template)
+        output_dir (str): Directory to save the HTML file (default: same as json_gz_path)
+        validate (bool): Check that every log line is valid JSON (default: False)
+        use_zcat (bool): Decompress through an external zcat process (default: False)
+        verbose (bool): Print the path of the generated file (default: True)
+        
+    Returns:
+        str: Path to the generated HTML file, or None if failed
+    """
+    output_path = _output_path(json_gz_path, output_dir)
+    
+    # Stream the log straight from the decompressor into the new HTML file,
+    # replacing the template data. Write to a temporary file first so that a
+    # broken log never leaves a truncated HTML file behind.
+    temp_path = output_path + '.tmp'
+    try:
+        with open(temp_path, 'wb') as f:
+            _write_template_part(f, template.fd, 0, template.before_data)
+            _write_mjai_log(f, _iter_log_chunks(json_gz_path, use_zcat), json_gz_path, validate)
+            _write_template_part(f, template.fd, template.after_offset, template.after_data)
+        os.replace(temp_path, output_path)
+        
+        if verbose:
+            print(f"Generated: {output_path}")
+        return output_path
+    
+    except Exception as e:
+        print(f"Error generating HTML file {output_path} from {json_gz_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
+        return None
+
+
+async def _read_file_async(path):
+    """Read a whole file without blocking the event loop."""
+    if aiofiles is not None:
+        async with aiofiles.open(path, 'rb') as f:
+            return await f.read()
+    
+    return await asyncio.get_running_loop().run_in_executor(None, _read_file, path)
+
+
+async def _write_html_async(output_path, chunks):
+    """Write byte chunks to output_path without blocking the event loop."""
+    if aiofiles is not None:
+        async with aiofiles.open(output_path, 'wb') as f:
+            for chunk in chunks:
+                await f.write(chunk)
+    else:
+        await asyncio.get_running_loop().run_in_executor(None, _write_html, output_path, chunks)
+
+
+async def generate_html_file_async(json_gz_path, template, output_dir=None, validate=False,
+                                   executor=None, verbose=True):
+    """
+    Asynchronous variant of generate_html_file.
+    
+    File reads and writes go through aiofiles (or the default thread pool when
+    it is not installed), while decompression and validation are offloaded to
+    executor so that I/O for other files can overlap with it.
+    
+    Args:
+        json_gz_path (str): Path to the .json.gz file
+        template (Template): The split HTML template (see _prepare_template)
+        output_dir (str): Directory to save the HTML file (default: same as json_gz_path)
+        validate (bool): Check that every log line is valid JSON (default: False)
+        executor: Executor running decode_mjai_log (default: the event loop's default executor)
+        verbose (bool): Print the path of the generated file (default: True)
+        
+    Returns:
+        str: Path to the generated HTML file, or None if failed
+    """
+    try:
+        compressed = await _read_file_async(json_gz_path)
+    except Exception as e:
+        print(f"Error extracting {json_gz_path}: {e}")
+        return None
+    
+    mjai_data = await asyncio.get_running_loop().run_in_executor(
+        executor, decode_mjai_log, compressed, json_gz_path, validate)
+    if mjai_data is None:
+        return None
+    
+    output_path = _output_path(json_gz_path, output_dir)
+    
+    # Write to a temporary file first, as generate_html_file does, so that a
+    # failed write never leaves a truncated HTML file behind
+    temp_path = output_path + '.tmp'
     try:
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(new_content)
+        await _write_html_async(temp_path, (template.before_data, mjai_data, template.after_data))
+        os.replace(temp_path, output_path)
         
-        print(f"Generated: {output_path}")
+        if verbose:
+            print(f"Generated: {output_path}")
         return output_path
     
     except Exception as e:
         print(f"Error writing HTML file {output_path}: {e}")
+        try:
+            os.remove(temp_path)
+        except OSError:
+            pass
         return None
 
 
-def process_directory(input_dir, template_path, output_dir=None, pattern="*.json.gz"):
+async def _process_files_async(tasks, template, output_dir, validate, executor, on_result):
+    """
+    Run generate_html_file_async over tasks with at most ASYNC_IO_CONCURRENCY files in flight.
+    
+    on_result is called with (json_gz_path, html_file) as each file completes.
+    """
+    pending = {}
+    for json_gz_path in tasks:
+        if len(pending) >= ASYNC_IO_CONCURRENCY:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                on_result(pending.pop(future), future.result())
+        future = asyncio.ensure_future(generate_html_file_async(
+            json_gz_path, template, output_dir=output_dir, validate=validate, executor=executor,
+            verbose=False))
+        pending[future] = json_gz_path
+    
+    if pending:
+        done, _ = await asyncio.wait(pending)
+        for future in done:
+            on_result(pending[future], future.result())
+
+
+# Template slices of the current worker process, set by _init_worker
+_worker_template = None
+
+
+def _init_worker(template_path):
+    """Map and split the template once per worker process, for its whole lifetime."""
+    global _worker_template
+    _worker_template = _prepare_template(template_path)
+
+
+def _generate_html_worker(json_gz_path, **kwargs):
+    """Generate an HTML file in a worker process using its stored template."""
+    if _worker_template is None:
+        return None  # already reported by _prepare_template
+    
+    return generate_html_file(json_gz_path, _worker_template, **kwargs)
+
+
+def _imap_bounded(executor, fn, iterable, max_pending):
+    """
+    Lazily submit fn over iterable, keeping at most max_pending tasks in flight.
+    
+    Unlike Executor.map, the iterable is not consumed up front, so work starts
+    immediately and memory stays bounded for very large inputs.
+    
+    Yields:
+        tuple: (item, result) pairs in completion order
+    """
+    pending = {}
+    for item in iterable:
+        if len(pending) >= max_pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield pending.pop(future), future.result()
+        pending[executor.submit(fn, item)] = item
+    for future in as_completed(pending):
+        yield pending[future], future.result()
+
+
+def _iter_matching_entries(entries, pattern):
+    """Yield the paths of the scandir entries that are files matching pattern."""
+    with entries:
+        for entry in entries:
+            if fnmatch(entry.name, pattern) and entry.is_file():
+                yield entry.path
+
+
+def _iter_json_gz_files(input_dir, pattern):
+    """
+    Lazily list the files under input_dir matching pattern.
+    
+    Plain file name patterns go through os.scandir, which returns the file type
+    along with each name, so this needs no extra stat calls and yields plain
+    str paths. Patterns reaching into subdirectories (e.g. "sub/*.json.gz" or
+    "**/*.json.gz") are handed to Path.glob.
+    
+    Returns:
+        Iterator of str paths of the matching files
+        
+    Raises:
+        OSError: If input_dir cannot be listed
+    """
+    if '/' in pattern or os.sep in pattern or '**' in pattern:
+        return (str(path) for path in Path(input_dir).glob(pattern) if path.is_file())
+    
+    # Open the directory right away, so that errors surface here rather than
+    # wherever the paths are first consumed
+    return _iter_matching_entries(os.scandir(input_dir), pattern)
+
+
+def process_directory(input_dir, template_path, output_dir=None, pattern="*.json.gz", validate=False,
+                      use_zcat=False, limit=None, workers=None, async_io=False, quiet=False,
+                      native=False):
     """
     Process all .json.gz files in a directory.
     
@@ -119,12 +579,19 @@ def process_directory(input_dir, template_path, output_dir=None, pattern="*.json
         input_dir (str): Directory containing .json.gz files
         template_path (str): Path to the index.example.html template
         output_dir (str): Directory to save HTML files (default: same as input_dir)
-        pattern (str): File pattern to match (default: "*.json.gz")
+        pattern (str): File name pattern to match (default: "*.json.gz")
+        validate (bool): Check that every log line is valid JSON (default: False)
+        use_zcat (bool): Decompress through an external zcat process (default: False)
+        limit (int): Maximum number of files to process (default: no limit)
+        workers (int): Number of worker processes (default: number of CPUs)
+        async_io (bool): Overlap file I/O with decoding using asyncio (default: False)
+        quiet (bool): Do not report progress (default: False)
+        native (bool): Use libriichi's native implementation when it is available and
+            neither use_zcat nor async_io is set (default: False)
         
     Returns:
         list: List of paths to generated HTML files
     """
-    input_path = Path(input_dir)
     generated_files = []
     
     # Safety check: ensure we're only processing .json.gz files
@@ -134,24 +601,97 @@ def process_directory(input_dir, template_path, output_dir=None, pattern="*.json
             print("Error: Will only process compressed files for safety")
             return generated_files
     
-    json_gz_files = list(input_path.glob(pattern))
+    # Read and split the template once for the whole directory
+    template = _prepare_template(template_path)
+    if template is None:
+        return generated_files
     
-    if not json_gz_files:
-        print(f"No files matching '{pattern}' found in {input_dir}")
+    if native and NativeHtmlGenerator is None:
+        print("Warning: libriichi.log_viewer is not importable, using the Python implementation")
+    
+    # Stream paths straight from the directory listing instead of collecting them first
+    try:
+        tasks = _iter_json_gz_files(input_dir, pattern)
+    except OSError as e:
+        print(f"Error: Could not list {input_dir}: {e}")
+        template.close()
         return generated_files
+    if limit is not None:
+        tasks = islice(tasks, limit)
     
-    print(f"Found {len(json_gz_files)} files to process...")
+    # Each file is independent, so spread them over worker processes. Threads
+    # would not help here since decompression and parsing hold the GIL.
+    worker = partial(_generate_html_worker, output_dir=output_dir, validate=validate,
+                     use_zcat=use_zcat, verbose=False)
+    workers = workers or os.cpu_count() or 1
     
-    for i, json_gz_file in enumerate(json_gz_files, 1):
-        print(f"Processing {i}/{len(json_gz_files)}: {json_gz_file.name}")
-        
-        html_file = generate_html_file(str(json_gz_file), template_path, output_dir)
+    processed = 0
+    
+    def on_result(json_gz_file, html_file):
+        nonlocal processed
+        processed += 1
+        # Per-file messages would mean one write per file on the hot path
+        if not quiet and processed % PROGRESS_INTERVAL == 0:
+            print(f"Processed {processed} files...")
         if html_file:
             generated_files.append(html_file)
     
+    executor = None
+    try:
+        if async_io:
+            # The template stays in this process; workers only decode
+            if workers > 1:
+                executor = ProcessPoolExecutor(max_workers=workers)
+            asyncio.run(_process_files_async(tasks, template, output_dir, validate, executor,
+                                             on_result))
+        elif native and not use_zcat and NativeHtmlGenerator is not None:
+            # Decompression, validation and writing all run in native threads
+            # with the GIL released, so neither worker processes nor the
+            # Python-level loops are involved. The generator keeps its pool of
+            # workers threads across batches.
+            generator = NativeHtmlGenerator(bytes(template.before_data),
+                                            bytes(template.after_data), output_dir=output_dir,
+                                            validate=validate, workers=workers)
+            for batch in iter(lambda: list(islice(tasks, NATIVE_BATCH_SIZE)), []):
+                for task, html_file in zip(batch, generator.generate(batch)):
+                    on_result(task, os.fspath(html_file) if html_file is not None else None)
+        elif workers == 1:
+            # Work in this process with the template already prepared above
+            worker = partial(generate_html_file, template=template, output_dir=output_dir,
+                             validate=validate, use_zcat=use_zcat, verbose=False)
+            for task in tasks:
+                on_result(task, worker(task))
+        else:
+            executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                           initargs=(template_path,))
+            for task, html_file in _imap_bounded(executor, worker, tasks, max_pending=workers * 4):
+                on_result(task, html_file)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+        template.close()
+    
+    # With limit=0 nothing was looked for, so an empty result says nothing
+    if processed == 0 and limit != 0:
+        print(f"No files matching '{pattern}' found in {input_dir}")
+    
     return generated_files
 
 
+def _int_at_least(minimum):
+    """Return an argparse type accepting integers of at least minimum."""
+    def parse(value):
+        try:
+            number = int(value)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"invalid integer: {value}")
+        if number < minimum:
+            raise argparse.ArgumentTypeError(f"must be at least {minimum}, got {value}")
+        return number
+    
+    return parse
+
+
 def main():
     # Get the directory where this script is located
     script_dir = os.path.dirname(os.path.abspath(__file__))
@@ -162,9 +702,26 @@ def main():
                         help="Path to the HTML template file (default: index.example.html in script directory)")
     parser.add_argument("--output", "-o", help="Output directory (default: same as input)")
     parser.add_argument("--pattern", default="*.json.gz", 
-                        help="File pattern for directory processing (default: *.json.gz)")
-    parser.add_argument("--limit", "-l", type=int, 
+                        help="File name pattern for directory processing (default: *.json.gz)")
+    parser.add_argument("--limit", "-l", type=_int_at_least(0),
                         help="Limit number of files to process (for testing)")
+    parser.add_argument("--workers", "-j", type=_int_at_least(1),
+                        help="Number of worker processes for directory processing (default: number of CPUs)")
+    parser.add_argument("--quiet", "-q", action="store_true",
+                        help="Only report warnings and errors")
+    parser.add_argument("--validate", action="store_true",
+                        help="Check that every log line is valid JSON, skipping invalid lines "
+                             "(off by default since logs normally come from a trusted pipeline)")
+    parser.add_argument("--native", action="store_true",
+                        help="Use libriichi's native implementation for directory processing "
+                             "(requires libriichi built with its log_viewer feature; "
+                             "not used with --use-zcat or --async-io)")
+    io_group = parser.add_mutually_exclusive_group()
+    io_group.add_argument("--use-zcat", action="store_true",
+                          help="Decompress logs through an external zcat process (Linux)")
+    io_group.add_argument("--async-io", action="store_true",
+                          help="Overlap file I/O with decoding using asyncio for directory processing "
+                               "(uses aiofiles if installed)")
     
     args = parser.parse_args()
     
@@ -179,30 +736,41 @@ def main():
             print("Error: Input file must be a .json.gz file")
             sys.exit(1)
         
-        html_file = generate_html_file(args.input, args.template, args.output)
+        template = _prepare_template(args.template)
+        if template is None:
+            sys.exit(1)
+        
+        try:
+            html_file = generate_html_file(args.input, template, output_dir=args.output,
+                                           validate=args.validate, use_zcat=args.use_zcat,
+                                           verbose=False)
+        finally:
+            template.close()
         if html_file:
-            print(f"Successfully generated: {html_file}")
+            if not args.quiet:
+                print(f"Successfully generated: {html_file}")
         else:
             print("Failed to generate HTML file")
             sys.exit(1)
     
     elif os.path.isdir(args.input):
         # Process directory
-        generated_files = process_directory(args.input, args.template, args.output, args.pattern)
-        
-        if args.limit and len(generated_files) > args.limit:
-            # Remove excess HTML files if limit specified (only touch .html files)
-            for file_path in generated_files[args.limit:]:
-                try:
-                    # Safety check: only remove .html files in output directory
-                    if file_path.endswith('.html') and os.path.exists(file_path):
-                        os.remove(file_path)
-                        print(f"Removed (limit exceeded): {file_path}")
-                except Exception as e:
-                    print(f"Warning: Could not remove {file_path}: {e}")
-            generated_files = generated_files[:args.limit]
+        generated_files = process_directory(
+            args.input,
+            args.template,
+            output_dir=args.output,
+            pattern=args.pattern,
+            validate=args.validate,
+            use_zcat=args.use_zcat,
+            limit=args.limit,
+            workers=args.workers,
+            async_io=args.async_io,
+            quiet=args.quiet,
+            native=args.native,
+        )
         
-        print(f"\nSuccessfully generated {len(generated_files)} HTML files")
+        if not args.quiet:
+            print(f"\nSuccessfully generated {len(generated_files)} HTML files")
     
     else:
         print(f"Error: Input path does not exist: {args.input}")